@@ -0,0 +1,43 @@
+import json
+import math
+
+try:
+    import orjson
+except ImportError:  # optional dependency, see the "orjson" extra
+    orjson = None
+
+
+def _replace_non_finite(obj):
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    return obj
+
+
+def dumps(obj) -> bytes:
+    """
+    Serializes `obj` to compact JSON bytes, using orjson when it is installed.
+
+    Both backends produce the same bytes: output is UTF-8 without escaping,
+    non-string dict keys are converted to strings and NaN or infinite floats
+    are written as null.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+    except ValueError:
+        return json.dumps(_replace_non_finite(obj), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data):
+    """
+    Parses JSON from bytes or str, using orjson when it is installed.
+    Invalid documents raise a `ValueError` subclass with either backend.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
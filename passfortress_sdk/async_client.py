@@ -0,0 +1,246 @@
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+import aiohttp
+
+from . import _json
+from .client import ClientResponse, PassfortressClient, _base_url_for, _BaseClient
+from .decorators import async_refresh_token_on_expiry
+from .retry import JITTER_FULL, JITTER_MODES, backoff_time
+from .tokens import token_expiry
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPassfortressClient(_BaseClient):
+    """
+    asyncio client for the Passfortress API built on aiohttp.
+
+    Every endpoint method is a coroutine, so several calls can be in flight at
+    once over the same connection pool:
+
+        async with AsyncPassfortressClient(api_key, secret_key, master_key) as client:
+            responses = await asyncio.gather(*[client.get_secret(uuid) for uuid in uuids])
+
+    Up to `pool_maxsize` requests are sent at once; the rest wait for a pooled
+    connection. When the client is not used as a context manager, call
+    `await client.close()` once it is no longer needed. An existing
+    `aiohttp.ClientSession` can be passed as `session`, in which case it is
+    left open.
+
+    The access token is requested on the first API call.
+    """
+
+    DEFAULT_RETRIES_TOTAL = 2
+    DEFAULT_BACKOFF_FACTOR = 0.3
+    DEFAULT_POOL_MAXSIZE = PassfortressClient.DEFAULT_POOL_MAXSIZE
+    DEFAULT_KEEPALIVE_TIMEOUT = 75
+
+    def __init__(
+            self,
+            api_key,
+            secret_key,
+            master_key,
+            host="app.passfortress.com",
+            timeout: Optional[Tuple[float, float]] = None,
+            retries_total: int = DEFAULT_RETRIES_TOTAL,
+            backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+            jitter: str = JITTER_FULL,
+            session: Optional[aiohttp.ClientSession] = None,
+            pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+            keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+            token_cache=None,
+            compress_requests: bool = False,
+    ):
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.master_key = master_key
+        self.host = host
+        self.base_url = _base_url_for(host)
+        self._endpoint_urls = self._build_endpoint_urls()
+
+        # Networking configuration
+        connect_timeout, read_timeout = timeout or self.DEFAULT_TIMEOUT
+        self._timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self._retries_total = retries_total
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"jitter must be one of {JITTER_MODES}, got {jitter!r}")
+        self._backoff_factor = backoff_factor
+        self._jitter = jitter
+        self._pool_maxsize = pool_maxsize
+        self._keepalive_timeout = keepalive_timeout
+
+        # a caller-provided session is used as is and left open on close()
+        self._session = session
+        self._owns_session = session is None
+
+        self._token_cache = token_cache
+        self._compress_requests = compress_requests
+        self.access_token = None
+        self._token_expiry = None
+        # endpoint payloads are sent as pre-encoded JSON bytes
+        self._request_headers = {"Content-Type": "application/json"}
+        self._auth_lock = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions must be created inside the running event loop
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=self._timeout,
+                connector=aiohttp.TCPConnector(
+                    limit=self._pool_maxsize,
+                    keepalive_timeout=self._keepalive_timeout,
+                ),
+            )
+        return self._session
+
+    def _set_access_token(self, access_token):
+        self.access_token = access_token
+        self._token_expiry = token_expiry(access_token)
+        self._store_access_token(access_token)
+        self._request_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        }
+
+    def _clear_access_token(self):
+        # a token that could not be refreshed is dropped, so that the next call
+        # requests a new one instead of trying to refresh it again
+        self._discard_cached_access_token(self.access_token)
+        self.access_token = None
+        self._token_expiry = None
+        self._request_headers = {"Content-Type": "application/json"}
+
+    async def _post_token_request(self, endpoint_name, json_dict):
+        try:
+            async with self._get_session().post(
+                    self._endpoint_urls[endpoint_name],
+                    headers={"Content-Type": "application/json"},
+                    data=_json.dumps(json_dict),
+                    timeout=self._timeout,
+            ) as response:
+                if response.status >= 400:
+                    logger.error("%s failed with status %s", endpoint_name, response.status)
+                    return None
+                response_dict = _json.loads(await response.read())
+                self._set_access_token(response_dict.get("access_token"))
+                return self.access_token
+        except Exception as error:
+            logger.error("%s failed: %s", endpoint_name, error)
+            return None
+
+    async def _auth_request_token(self):
+        json_dict = {
+            "api_key": self.api_key,
+            "secret_key": self.secret_key
+        }
+        return await self._post_token_request(self.REQUEST_TOKEN, json_dict)
+
+    def _get_auth_lock(self) -> asyncio.Lock:
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        return self._auth_lock
+
+    async def _ensure_access_token(self):
+        # concurrent first calls wait for a single token request
+        async with self._get_auth_lock():
+            if self.access_token is None:
+                cached_access_token = self._cached_access_token()
+                if cached_access_token is not None:
+                    self._set_access_token(cached_access_token)
+                else:
+                    await self._auth_request_token()
+
+    async def _auth_refresh_token(self):
+        json_dict = {
+            "api_key": self.api_key,
+            "secret_key": self.secret_key,
+            "access_token": self.access_token
+        }
+        return await self._post_token_request(self.REFRESH_TOKEN, json_dict)
+
+    async def _refresh_access_token(self, stale_access_token):
+        # coroutines that waited on the lock reuse the token fetched meanwhile
+        async with self._get_auth_lock():
+            if self.access_token != stale_access_token:
+                return self.access_token
+            access_token = await self._auth_refresh_token()
+            if access_token is None:
+                self._clear_access_token()
+            return access_token
+
+    @async_refresh_token_on_expiry
+    async def _perform_request(self, endpoint_name, payload, content_encoding=None):
+        headers = self._request_headers
+        if content_encoding is not None:
+            headers = {**headers, "Content-Encoding": content_encoding}
+
+        # get API response using the pooled session, retrying transient failures
+        for retry_number in range(self._retries_total + 1):
+            if retry_number:
+                await asyncio.sleep(backoff_time(self._backoff_factor, retry_number, self._jitter))
+            is_last_attempt = retry_number == self._retries_total
+
+            try:
+                async with self._get_session().post(
+                        self._endpoint_urls[endpoint_name],
+                        headers=headers,
+                        data=payload,
+                        timeout=self._timeout,
+                ) as api_response:
+                    if api_response.status in self.DEFAULT_STATUS_FORCELIST and not is_last_attempt:
+                        continue
+
+                    # build and return SDK response
+                    return self._build_client_response(
+                        api_response.status,
+                        api_response.headers.get("Content-Type", ""),
+                        await api_response.read(),
+                    )
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if not is_last_attempt:
+                    continue
+
+                # Network-level issue (timeout, connection error, etc.)
+                logger.warning("request to %s failed: %s", endpoint_name, error)
+                return ClientResponse(status_code=0, message=str(error), data={})
+
+    async def bulk(self, method_name, args_iter):
+        """
+        Calls one endpoint method concurrently for several inputs, bounded by `pool_maxsize`.
+
+        Tuples in `args_iter` are unpacked as positional arguments; any other item is
+        passed as the single argument.
+
+        Returns:
+            list of ClientResponse: One response per item, in the same order as `args_iter`.
+        """
+        method = getattr(self, method_name)
+        return list(await asyncio.gather(*[
+            method(*args) if isinstance(args, tuple) else method(args) for args in args_iter
+        ]))
+
+    async def get_secrets_bulk(self, secret_uuids):
+        """
+        Retrieves several secrets concurrently, bounded by `pool_maxsize`.
+
+        Returns:
+            list of ClientResponse: One response per UUID, in the same order as `secret_uuids`.
+        """
+        return await self.bulk("get_secret", secret_uuids)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Close the underlying aiohttp session if it was created by this client.
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
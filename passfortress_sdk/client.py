@@ -1,20 +1,77 @@
-import json
-from typing import Optional, Tuple
+"""
+Synchronous client for the Passfortress API.
+
+By default (`share_session=True`) clients with the same transport settings
+share one pool of HTTP connections. Closing such a client, leaving a `with`
+block or garbage collection does not release anything; the shared pool stays
+open until `PassfortressClient.close_shared_pool()` is called, e.g. at
+application shutdown.
+
+A client created with `share_session=False` owns its pool. Use it as a
+context manager so its connections are released deterministically; they are
+otherwise released by `close()` or when the client is garbage collected:
+
+    with PassfortressClient(api_key, secret_key, master_key, share_session=False) as client:
+        response = client.get_secret(secret_uuid)
+"""
+import functools
+import gzip
+import hashlib
+import http.cookiejar
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple, Union
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
+try:
+    import json_stream.httpx
+    import json_stream.requests
+except ImportError:  # optional dependency, see the "stream" extra
+    json_stream = None
+
+from . import _json
 from .decorators import refresh_token_on_expiry
+from .retry import JITTER_FULL, JitteredRetry
+from .transports import BoundedWaitHTTPAdapter, HttpxSession
+from .tokens import token_expiry
+
+logger = logging.getLogger(__name__)
+
+# sessions shared by clients created with share_session=True, keyed by transport settings
+_SHARED_SESSIONS: Dict[tuple, Union[requests.Session, HttpxSession]] = {}
+_shared_sessions_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _base_url_for(host: str) -> str:
+    protocol = "http"
+    # only passfortress.com and its subdomains, not e.g. evilpassfortress.com
+    if host == "passfortress.com" or host.endswith(".passfortress.com"):
+        protocol = "https"
+    return f"{protocol}://{host}"
 
 
 class ClientResponse:
 
-    def __init__(self, status_code):
+    # fixed attributes: no per-instance __dict__ for bulk results
+    __slots__ = ("status_code", "success", "message", "data")
+
+    def __init__(self, status_code, success=False, message="", data=None):
         self.status_code = status_code
+        self.success = success
+        self.message = message
+        self.data = {} if data is None else data
 
 
-class PassfortressClient:
+class _BaseClient:
+    """
+    Endpoint table, URL handling and endpoint methods shared by the sync and async
+    clients. On `AsyncPassfortressClient` the endpoint methods return a coroutine,
+    to be awaited for the `ClientResponse`.
+    """
 
     HELLO = "hello"
     REQUEST_TOKEN = "request_token"
@@ -56,187 +113,105 @@ class PassfortressClient:
         ADD_GROUP: "/api/add-group/",
     }
 
-    DEFAULT_RETRIES_TOTAL = 2
-    DEFAULT_RETRIES_CONNECT = 2
-    DEFAULT_RETRIES_READ = 2
-    DEFAULT_BACKOFF_FACTOR = 0.3
-    DEFAULT_STATUS_FORCELIST = (429, 500, 502, 503, 504)
-    DEFAULT_ALLOWED_METHODS = frozenset(["GET", "POST"])
-    DEFAULT_POOL_CONNECTIONS = 10
-    DEFAULT_POOL_MAXSIZE = 10
     DEFAULT_TIMEOUT: Tuple[float, float] = (2.0, 2.0)  # (connect, read)
+    DEFAULT_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+    TOKEN_EXPIRY_MARGIN = 30  # seconds before `exp` at which the token is refreshed
+    COMPRESSION_MIN_SIZE = 1024  # bytes; smaller bodies are not worth gzipping
 
-    def __init__(
-        self,
-        api_key, 
-            secret_key, 
-            master_key, 
-            host="app.passfortress.com",
-            timeout: Optional[Tuple[float, float]] = None,
-            retries_total: int = DEFAULT_RETRIES_TOTAL,
-            retries_connect: int = DEFAULT_RETRIES_CONNECT,
-            retries_read: int = DEFAULT_RETRIES_READ,
-            backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
-            pool_connections: int = DEFAULT_POOL_CONNECTIONS,
-            pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
-
-    ):
-        self.api_key = api_key
-        self.secret_key = secret_key
-        self.master_key = master_key
-        self.host = host
-        self.base_url = self._build_base_url()
-
-        # Networking configuration
-        self._timeout = timeout or self.DEFAULT_TIMEOUT
-        self._session = self._create_session(
-            retries_total=retries_total,
-            retries_connect=retries_connect,
-            retries_read=retries_read,
-            backoff_factor=backoff_factor,
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-        )
-
-        self.access_token = self._auth_request_token()
-
-    def _create_session(
-            self,
-            retries_total: int,
-            retries_connect: int,
-            retries_read: int,
-            backoff_factor: float,
-            pool_connections: int,
-            pool_maxsize: int,
-    ) -> requests.Session:
-        session = requests.Session()
-        retries = Retry(
-            total=retries_total,
-            connect=retries_connect,
-            read=retries_read,
-            backoff_factor=backoff_factor,
-            status_forcelist=self.DEFAULT_STATUS_FORCELIST,
-            allowed_methods=self.DEFAULT_ALLOWED_METHODS,
-            raise_on_status=False,  # do not raise automatically on status codes, we handle manually
-        )
-        adapter = HTTPAdapter(
-            max_retries=retries,
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-        )
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-        # Optionally set a common header to encourage keep-alive; requests already keeps alive by default.
-        session.headers.update({"Connection": "keep-alive"})
-        return session
-
-    def _build_base_url(self):
-        protocol = "http"
-        if self.host.endswith("passfortress.com"):
-            protocol = "https"
-        base_url = f"{protocol}://{self.host}"
-        return base_url
-
-    def _endpoint_url(self, endpoint_name):
-        return f"{self.base_url}{self.ENDPOINTS_URLS[endpoint_name]}"
+    def _build_endpoint_urls(self):
+        return {name: self.base_url + path for name, path in self.ENDPOINTS_URLS.items()}
 
-    def _auth_request_token(self):
-        endpoint_url = self._endpoint_url(self.REQUEST_TOKEN)
+    def _token_cache_key(self):
+        # tokens are only shared between clients holding the same credentials; the
+        # secret key is stored as a digest so it is not kept in the cache as is
+        secret_key_digest = hashlib.sha256(self.secret_key.encode("utf-8")).hexdigest()
+        return self.api_key, secret_key_digest, self.host
 
-        json_dict = {
-            "api_key": self.api_key,
-            "secret_key": self.secret_key
-        }
-        try:
-            response = self._session.post(
-                url=endpoint_url,
-                json=json_dict,
-                timeout=self._timeout,
-            )
-            response.raise_for_status()
-            return response.json().get("access_token")
-        except Exception as error:
-            print(error)
+    def _cached_access_token(self):
+        # a cached token is only reused while it is known to be valid for a while
+        if self._token_cache is None:
             return None
-
-    def _auth_refresh_token(self):
-        endpoint_url = self._endpoint_url(self.REFRESH_TOKEN)
-
-        json_dict = {
-            "api_key": self.api_key,
-            "secret_key": self.secret_key,
-            "access_token": self.access_token
-        }
-        try:
-            response = self._session.post(
-                url=endpoint_url,
-                json=json_dict,
-                timeout=self._timeout,
-            )
-            response.raise_for_status()
-            self.access_token = response.json().get("access_token")
-            return self.access_token
-        except Exception as error:
-            print(error)
+        access_token = self._token_cache.get(self._token_cache_key())
+        expiry = token_expiry(access_token)
+        if expiry is None or time.time() >= expiry - self.TOKEN_EXPIRY_MARGIN:
             return None
-
-    def _build_authorization_bearer(self):
-        return {"Authorization": f"Bearer {self.access_token}"}
-
-    @refresh_token_on_expiry
-    def _perform_request(self, endpoint_name, payload):
-
-        # build URL
-        endpoint_url = self._endpoint_url(endpoint_name)
-
-        # get API response using a pooled, retried session with explicit timeouts
-        try:
-            api_response = self._session.post(
-                url=endpoint_url,
-                headers=self._build_authorization_bearer(),
-                json=payload,
-                timeout=self._timeout,
+        return access_token
+
+    def _store_access_token(self, access_token):
+        if self._token_cache is not None and access_token is not None:
+            self._token_cache[self._token_cache_key()] = access_token
+
+    def _discard_cached_access_token(self, access_token):
+        # only drop the entry if no other client has replaced it meanwhile
+        if self._token_cache is None:
+            return
+        key = self._token_cache_key()
+        if self._token_cache.get(key) == access_token:
+            self._token_cache.pop(key, None)
+
+    @property
+    def api_key(self):
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, api_key):
+        self._api_key = api_key
+        self._credentials_json = None
+
+    @property
+    def master_key(self):
+        return self._master_key
+
+    @master_key.setter
+    def master_key(self, master_key):
+        self._master_key = master_key
+        self._credentials_json = None
+
+    def _encode_payload(self, body):
+        # the credentials are the same on every call, so their JSON is encoded
+        # once (without the closing brace) and only `body` is encoded per call
+        if self._credentials_json is None:
+            credentials = {"api_key": self._api_key, "master_key": self._master_key}
+            self._credentials_json = _json.dumps(credentials)[:-1]
+        if not body:
+            return self._credentials_json + b"}"
+        return self._credentials_json + b"," + _json.dumps(body)[1:]
+
+    def _post(self, endpoint_name, **body):
+        # the async client gets back the coroutine of its own _perform_request
+        payload = self._encode_payload(body)
+        if self._compress_requests and len(payload) >= self.COMPRESSION_MIN_SIZE:
+            return self._perform_request(
+                endpoint_name=endpoint_name,
+                payload=gzip.compress(payload, compresslevel=1),
+                content_encoding="gzip",
             )
-
-            # build SDK response
-            client_response = ClientResponse(status_code=api_response.status_code)
-
-            try:
-                response_dict = api_response.json()
-                client_response.success = response_dict.pop("success", False)
-                client_response.message = response_dict.pop("message", "")
-                client_response.data = response_dict
-            except ValueError as error:
-                client_response.success = False
-                client_response.message = error
-
-            # return SDK response
-            return client_response
-
-        except requests.RequestException as error:
-            # Network-level issue (timeout, connection error, etc.)
-            client_response = ClientResponse(status_code=0)
-            client_response.success = False
-            client_response.message = str(error)
-            client_response.data = {}
-            return client_response
-
-    def hello(self):
-
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "greeting": "hello",
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.HELLO,
-            payload=payload
+        return self._perform_request(endpoint_name=endpoint_name, payload=payload)
+
+    def _token_expires_soon(self):
+        if self._token_expiry is None:
+            return False
+        return time.time() >= self._token_expiry - self.TOKEN_EXPIRY_MARGIN
+
+    @staticmethod
+    def _build_client_response(status_code, content_type, content):
+        # non-JSON bodies (e.g. a proxy's HTML error page) are not parsed at all
+        if not content_type.startswith("application/json"):
+            message = content[:256].decode("utf-8", errors="replace")
+            return ClientResponse(status_code=status_code, message=message, data={})
+        try:
+            response_dict = _json.loads(content)
+        except ValueError as error:
+            return ClientResponse(status_code=status_code, message=error)
+        return ClientResponse(
+            status_code=status_code,
+            success=response_dict.pop("success", False),
+            message=response_dict.pop("message", ""),
+            data=response_dict,
         )
 
-        return sdk_response
+    def hello(self):
+        return self._post(self.HELLO, greeting="hello")
 
     def get_secret(self, secret_uuid):
         """
@@ -246,27 +221,11 @@ class PassfortressClient:
             secret_uuid (str): The UUID of the secret to retrieve.
 
         Returns:
-            requests.Response: The response object from the API containing the secret's
+            ClientResponse: The response from the API containing the secret's
             details or an error message.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "secret": {"uuid": secret_uuid},
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.GET_SECRET,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.GET_SECRET, secret={"uuid": secret_uuid})
 
     def add_secret(self, secret_data):
         """
@@ -294,27 +253,11 @@ class PassfortressClient:
                     - value (str): **Required**. The identifier value.
 
         Returns:
-            requests.Response: The response object from the API containing the result of the
+            ClientResponse: The response from the API containing the result of the
             operation, such as success confirmation or an error message.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "secret": secret_data,
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.ADD_SECRET,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.ADD_SECRET, secret=secret_data)
 
     def accept_shared_secret(self, secret_data, tmp_master_key):
         """
@@ -328,28 +271,11 @@ class PassfortressClient:
             tmp_master_key (str): **Required**. A temporary master key used to decrypt the shared secret.
 
         Returns:
-            requests.Response: The response object from the API containing the result of the operation,
+            ClientResponse: The response from the API containing the result of the operation,
             such as success confirmation or an error message.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "tmp_master_key": tmp_master_key,
-            "master_key": self.master_key,
-            "secret": secret_data,
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.ACCEPT_SHARED_SECRET,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.ACCEPT_SHARED_SECRET, tmp_master_key=tmp_master_key, secret=secret_data)
 
     def get_containers(self, container_data):
         """
@@ -363,27 +289,11 @@ class PassfortressClient:
                 - description (str): Optional. The description (partial or total) of the container to filter by.
 
         Returns:
-            requests.Response: The response object from the API containing the list of containers
+            ClientResponse: The response from the API containing the list of containers
             matching the provided filters or an error message if the request fails.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "container": container_data
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.GET_CONTAINERS,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.GET_CONTAINERS, container=container_data)
 
     def get_container(self, container_uuid):
         """
@@ -393,27 +303,11 @@ class PassfortressClient:
             container_uuid (str): The UUID of the container to retrieve.
 
         Returns:
-            requests.Response: The response object from the API containing the container's
+            ClientResponse: The response from the API containing the container's
             details or an error message.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "container": {"uuid": container_uuid},
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.GET_CONTAINER,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.GET_CONTAINER, container={"uuid": container_uuid})
 
     def add_container(self, container_data):
         """
@@ -426,27 +320,11 @@ class PassfortressClient:
                 - description (str): Optional. A description of the container.
 
         Returns:
-            requests.Response: The response object from the API containing the result of the
+            ClientResponse: The response from the API containing the result of the
             update operation, such as success confirmation or an error message.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "container": container_data
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.ADD_CONTAINER,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.ADD_CONTAINER, container=container_data)
 
     def update_container(self, container_data):
         """
@@ -460,27 +338,11 @@ class PassfortressClient:
                 - description (str): Optional. A description of the container.
 
         Returns:
-            requests.Response: The response object from the API containing the result of the
+            ClientResponse: The response from the API containing the result of the
             update operation, such as success confirmation or an error message.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "container": container_data,
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.UPDATE_CONTAINER,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.UPDATE_CONTAINER, container=container_data)
 
     def delete_container(self, container_uuid):
         """
@@ -490,26 +352,10 @@ class PassfortressClient:
             container_uuid (str): The UUID of the container to be deleted.
 
         Returns:
-            requests.Response: The response object from the API containing the status of operation.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
+            ClientResponse: The response from the API containing the status of operation.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "container": {"uuid": container_uuid},
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.DELETE_CONTAINER,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.DELETE_CONTAINER, container={"uuid": container_uuid})
 
     def get_groups(self, group_data):
         """
@@ -523,27 +369,11 @@ class PassfortressClient:
                 - description (str): Optional. The description (partial or total) of the group to filter by.
 
         Returns:
-            requests.Response: The response object from the API containing the list of groups
+            ClientResponse: The response from the API containing the list of groups
             matching the provided filters or an error message if the request fails.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "group": group_data
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.GET_GROUPS,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.GET_GROUPS, group=group_data)
 
     def add_group(self, group_data):
         """
@@ -560,27 +390,11 @@ class PassfortressClient:
                     - content(str): **Required**. The image as a base64 encoded string.
 
         Returns:
-            requests.Response: The response object from the API containing the result of the
+            ClientResponse: The response from the API containing the result of the
             add operation, such as success confirmation or an error message.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "group": group_data
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.ADD_GROUP,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.ADD_GROUP, group=group_data)
 
     def delete_secret(self, secret_uuid):
         """
@@ -590,26 +404,10 @@ class PassfortressClient:
             secret_uuid (str): The UUID of the secret to be deleted.
 
         Returns:
-            requests.Response: The response object from the API containing the status of operation.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
+            ClientResponse: The response from the API containing the status of operation.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "secret": {"uuid": secret_uuid},
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.DELETE_SECRET,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.DELETE_SECRET, secret={"uuid": secret_uuid})
 
     def update_secret(self, secret_data):
         """
@@ -638,27 +436,11 @@ class PassfortressClient:
                     - value (str): **Required**. The identifier value.
 
         Returns:
-            requests.Response: The response object from the API containing the result of the
+            ClientResponse: The response from the API containing the result of the
             update operation, such as success confirmation or an error message.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "secret": secret_data,
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.UPDATE_SECRET,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.UPDATE_SECRET, secret=secret_data)
 
     def get_secrets(self, secret_data):
         """
@@ -691,27 +473,11 @@ class PassfortressClient:
                 - shared (bool): Optional. Whether to retrieve shared secrets. Defaults to `False`.
 
         Returns:
-            requests.Response: The response object from the API containing the list of secrets
+            ClientResponse: The response from the API containing the list of secrets
             matching the provided filters or an error message if the request fails.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "secret": secret_data,
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.GET_SECRETS,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.GET_SECRETS, secret=secret_data)
 
     def duplicate_secret(self, secret_uuid):
         """
@@ -721,29 +487,11 @@ class PassfortressClient:
             secret_uuid (str): The UUID of the secret to duplicate.
 
         Returns:
-            requests.Response: The response object from the API containing the duplicated secret
+            ClientResponse: The response from the API containing the duplicated secret
             details or an error message if the request fails.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
-            "api_key": self.api_key,
-            "master_key": self.master_key,
-            "secret": {
-                "uuid": secret_uuid,
-            },
-        }
-
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.DUPLICATE_SECRET,
-            payload=payload
-        )
-
-        return sdk_response
+        return self._post(self.DUPLICATE_SECRET, secret={"uuid": secret_uuid})
 
     def share_secret(self, secret_uuid, emails_list):
         """
@@ -754,38 +502,425 @@ class PassfortressClient:
             emails_list (list of str): The list of emails to share with.
 
         Returns:
-            requests.Response: The response object from the API containing the shared secret
+            ClientResponse: The response from the API containing the shared secret
             details or an error message if the request fails.
-
-        Raises:
-            requests.RequestException: If the request to the API fails or encounters an error.
         """
 
-        # payload definition
-        payload = {
+        return self._post(self.SHARE_SECRET, secret={"uuid": secret_uuid}, emails=emails_list)
+
+
+class PassfortressClient(_BaseClient):
+
+    TRANSPORT_REQUESTS = "requests"
+    TRANSPORT_HTTPX = "httpx"  # HTTP/2, requires the "http2" extra
+
+    DEFAULT_RETRIES_TOTAL = 2
+    DEFAULT_RETRIES_CONNECT = 2
+    DEFAULT_RETRIES_READ = 2
+    DEFAULT_BACKOFF_FACTOR = 0.3
+    DEFAULT_ALLOWED_METHODS = frozenset(["GET", "POST"])
+    DEFAULT_POOL_CONNECTIONS = 32
+    DEFAULT_POOL_MAXSIZE = 32
+    DEFAULT_POOL_BLOCK = True  # wait (up to the connect timeout) for a pooled connection instead of opening a throwaway one
+    DEFAULT_BULK_MAX_WORKERS = 10
+
+    def __init__(
+        self,
+        api_key, 
+            secret_key, 
+            master_key, 
+            host="app.passfortress.com",
+            timeout: Optional[Tuple[float, float]] = None,
+            retries_total: int = DEFAULT_RETRIES_TOTAL,
+            retries_connect: int = DEFAULT_RETRIES_CONNECT,
+            retries_read: int = DEFAULT_RETRIES_READ,
+            backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+            jitter: str = JITTER_FULL,
+            pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+            pool_block: bool = DEFAULT_POOL_BLOCK,
+            token_cache=None,
+            compress_requests: bool = False,
+            transport: str = TRANSPORT_REQUESTS,
+            eager_auth: bool = False,
+            share_session: bool = True,
+    ):
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.master_key = master_key
+        self.host = host
+        self.base_url = _base_url_for(host)
+        self._endpoint_urls = self._build_endpoint_urls()
+
+        # Networking configuration
+        self._timeout = timeout or self.DEFAULT_TIMEOUT
+        self._transport = transport
+        self._share_session = share_session
+        self._auth_headers = None
+        self._session_config = dict(
+            retries_total=retries_total,
+            retries_connect=retries_connect,
+            retries_read=retries_read,
+            backoff_factor=backoff_factor,
+            jitter=jitter,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        # clients with the same transport settings reuse one connection pool,
+        # and with it the open keep-alive connections to the API
+        self._shared_session_key = (transport,) + tuple(sorted(self._session_config.items()))
+        self._own_session = None
+        if share_session:
+            self._shared_session()
+        else:
+            self._own_session = self._build_session(**self._session_config)
+
+        # the access token is requested on the first API call unless `eager_auth`,
+        # in which case a client that cannot authenticate fails here
+        self._refresh_lock = threading.Lock()
+        self._token_cache = token_cache
+        self._compress_requests = compress_requests
+        self.access_token = None
+        self._token_expiry = None
+        if eager_auth:
+            self._ensure_access_token()
+            if self.access_token is None:
+                raise requests.RequestException(f"could not obtain an access token from {self.host}")
+
+    @property
+    def _session(self) -> Union[requests.Session, HttpxSession]:
+        if self._own_session is not None:
+            return self._own_session
+        return self._shared_session()
+
+    def _shared_session(self) -> Union[requests.Session, HttpxSession]:
+        # looked up on every request rather than kept on the client, so that
+        # after close_shared_pool() live clients move on to a new pool
+        session = _SHARED_SESSIONS.get(self._shared_session_key)
+        if session is not None:
+            return session
+        with _shared_sessions_lock:
+            if self._shared_session_key not in _SHARED_SESSIONS:
+                session = self._build_session(**self._session_config)
+                # the session serves every client, so cookies set for one must
+                # never be sent with another's requests: store none at all
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                _SHARED_SESSIONS[self._shared_session_key] = session
+            return _SHARED_SESSIONS[self._shared_session_key]
+
+    def _build_session(
+            self,
+            retries_total: int,
+            retries_connect: int,
+            retries_read: int,
+            backoff_factor: float,
+            jitter: str,
+            pool_connections: int,
+            pool_maxsize: int,
+            pool_block: bool,
+    ) -> Union[requests.Session, HttpxSession]:
+        if self._transport == self.TRANSPORT_HTTPX:
+            return self._create_httpx_session(
+                retries_total=retries_total,
+                backoff_factor=backoff_factor,
+                jitter=jitter,
+                pool_maxsize=pool_maxsize,
+            )
+        if self._transport != self.TRANSPORT_REQUESTS:
+            raise ValueError(f"unknown transport {self._transport!r}")
+
+        session = requests.Session()
+        retries = JitteredRetry(
+            total=retries_total,
+            connect=retries_connect,
+            read=retries_read,
+            backoff_factor=backoff_factor,
+            jitter=jitter,
+            status_forcelist=self.DEFAULT_STATUS_FORCELIST,
+            allowed_methods=self.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,  # do not raise automatically on status codes, we handle manually
+        )
+        adapter = BoundedWaitHTTPAdapter(
+            max_retries=retries,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # request bodies are sent as pre-encoded JSON bytes
+        session.headers["Content-Type"] = "application/json"
+        return session
+
+    def _create_httpx_session(
+            self,
+            retries_total: int,
+            backoff_factor: float,
+            jitter: str,
+            pool_maxsize: int,
+    ) -> HttpxSession:
+        session = HttpxSession(
+            retries_total=retries_total,
+            backoff_factor=backoff_factor,
+            jitter=jitter,
+            status_forcelist=self.DEFAULT_STATUS_FORCELIST,
+            pool_maxsize=pool_maxsize,
+        )
+        # request bodies are sent as pre-encoded JSON bytes
+        session.headers["Content-Type"] = "application/json"
+        return session
+
+    def _auth_request_token(self):
+        endpoint_url = self._endpoint_urls[self.REQUEST_TOKEN]
+
+        json_dict = {
+            "api_key": self.api_key,
+            "secret_key": self.secret_key
+        }
+        try:
+            response = self._session.post(
+                url=endpoint_url,
+                data=_json.dumps(json_dict),
+                timeout=self._timeout,
+            )
+            if response.status_code >= 400:
+                logger.error("access token request failed with status %s", response.status_code)
+                return None
+            return _json.loads(response.content).get("access_token")
+        except Exception as error:
+            logger.error("access token request failed: %s", error)
+            return None
+
+    def _auth_refresh_token(self):
+        endpoint_url = self._endpoint_urls[self.REFRESH_TOKEN]
+
+        json_dict = {
             "api_key": self.api_key,
-            "master_key": self.master_key,
-            "secret": {
-                "uuid": secret_uuid,
-            },
-            "emails": emails_list,
+            "secret_key": self.secret_key,
+            "access_token": self.access_token
         }
+        try:
+            response = self._session.post(
+                url=endpoint_url,
+                data=_json.dumps(json_dict),
+                timeout=self._timeout,
+            )
+            if response.status_code >= 400:
+                logger.error("access token refresh failed with status %s", response.status_code)
+                return None
+            self._set_access_token(_json.loads(response.content).get("access_token"))
+            return self.access_token
+        except Exception as error:
+            logger.error("access token refresh failed: %s", error)
+            return None
+
+    def _ensure_access_token(self):
+        # concurrent first calls wait for a single token request; a valid
+        # cached token skips it altogether
+        with self._refresh_lock:
+            if self.access_token is None:
+                access_token = self._cached_access_token() or self._auth_request_token()
+                if access_token is not None:
+                    self._set_access_token(access_token)
+
+    def _refresh_access_token(self, stale_access_token):
+        # threads that waited on the lock reuse the token fetched meanwhile
+        with self._refresh_lock:
+            if self.access_token != stale_access_token:
+                return self.access_token
+            access_token = self._auth_refresh_token()
+            if access_token is None:
+                self._clear_access_token()
+            return access_token
+
+    def _set_access_token(self, access_token):
+        self.access_token = access_token
+        self._token_expiry = token_expiry(access_token)
+        self._store_access_token(access_token)
+        authorization = f"Bearer {access_token}"
+        if self._share_session:
+            # a shared session serves other clients, so the bearer is sent per request
+            self._auth_headers = {"Authorization": authorization}
+        else:
+            # keep the bearer on the session so it is sent with every request
+            self._session.headers["Authorization"] = authorization
+
+    def _clear_access_token(self):
+        # a token that could not be refreshed is dropped, so that the next call
+        # requests a new one instead of trying to refresh it again
+        self._discard_cached_access_token(self.access_token)
+        self.access_token = None
+        self._token_expiry = None
+        if self._share_session:
+            self._auth_headers = None
+        else:
+            self._session.headers.pop("Authorization", None)
+
+    @refresh_token_on_expiry
+    def _perform_request(self, endpoint_name, payload, content_encoding=None):
+
+        # build URL and per-request headers
+        endpoint_url = self._endpoint_urls[endpoint_name]
+        headers = self._auth_headers
+        if content_encoding is not None:
+            headers = {**(headers or {}), "Content-Encoding": content_encoding}
+
+        # get API response using a pooled, retried session with explicit timeouts
+        try:
+            api_response = self._session.post(
+                url=endpoint_url,
+                headers=headers,
+                data=payload,
+                timeout=self._timeout,
+            )
 
-        # build SDK response
-        sdk_response = self._perform_request(
-            endpoint_name=self.SHARE_SECRET,
-            payload=payload
+            # build and return SDK response
+            return self._build_client_response(
+                api_response.status_code,
+                api_response.headers.get("Content-Type", ""),
+                api_response.content,
+            )
+
+        except requests.RequestException as error:
+            # Network-level issue (timeout, connection error, etc.)
+            logger.warning("request to %s failed: %s", endpoint_url, error)
+            return ClientResponse(status_code=0, message=str(error), data={})
+
+    @refresh_token_on_expiry
+    def _perform_stream_request(self, endpoint_name, payload):
+        api_response = self._session.post(
+            url=self._endpoint_urls[endpoint_name],
+            headers=self._auth_headers,
+            data=payload,
+            timeout=self._timeout,
+            stream=True,
         )
+        if api_response.status_code == 452:
+            # release the connection before the decorator retries
+            api_response.close()
+        return api_response
+
+    def bulk(self, method_name, args_iter, max_workers: int = DEFAULT_BULK_MAX_WORKERS):
+        """
+        Calls one endpoint method concurrently for several inputs over the pooled session.
+
+        Example:
+            client.bulk("get_secret", secret_uuids, max_workers=32)
+
+        Args:
+            method_name (str): Name of the endpoint method to call, e.g. "get_secret".
+            args_iter (iterable): One item per call. Tuples are unpacked as positional
+            arguments; any other item is passed as the single argument.
+            max_workers (int): Maximum number of requests in flight at once. Values above
+            `pool_maxsize` gain nothing, as extra requests wait for a pooled connection.
+
+        Returns:
+            list of ClientResponse: One response per item, in the same order as `args_iter`.
+        """
+        method = getattr(self, method_name)
 
-        return sdk_response
+        def call(args):
+            return method(*args) if isinstance(args, tuple) else method(args)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(call, args_iter))
+
+    def get_secrets_bulk(self, secret_uuids, max_workers: int = DEFAULT_BULK_MAX_WORKERS):
+        """
+        Retrieves several secrets concurrently over the pooled session.
+
+        Args:
+            secret_uuids (list of str): The UUIDs of the secrets to retrieve.
+            max_workers (int): Maximum number of requests in flight at once. Values above
+            `pool_maxsize` gain nothing, as extra requests wait for a pooled connection.
+
+        Returns:
+            list of ClientResponse: One response per UUID, in the same order as `secret_uuids`.
+        """
+        return self.bulk("get_secret", secret_uuids, max_workers=max_workers)
+
+    def get_secrets_iter(self, secret_data, items_key="results"):
+        """
+        Streams the secrets matching the provided filters, parsing the response
+        incrementally instead of loading it into memory at once.
+
+        Requires the optional `json-stream` package (`pip install passfortress-sdk[stream]`).
+
+        Args:
+            secret_data (dict): The secret filters, as accepted by `get_secrets`.
+            items_key (str): The response key holding the list of secrets.
+
+        Returns:
+            iterator of dict: One secret at a time, in the order returned by the API.
+            The request is sent when iteration starts.
+
+        Raises:
+            ImportError: If `json-stream` is not installed, when the method is called.
+            requests.RequestException: While iterating, if the request to the API fails
+            or returns an error status.
+        """
+        # checked here rather than in the generator, which only runs on the first next()
+        if json_stream is None:
+            raise ImportError("get_secrets_iter requires json-stream: pip install passfortress-sdk[stream]")
+        return self._iter_secrets(secret_data, items_key)
+
+    def _iter_secrets(self, secret_data, items_key):
+        payload = self._encode_payload({"secret": secret_data})
+        api_response = self._perform_stream_request(self.GET_SECRETS, payload)
+        try:
+            if api_response.status_code >= 400:
+                raise requests.HTTPError(f"{api_response.status_code} Error for url: {api_response.url}")
+            if self._transport == self.TRANSPORT_HTTPX:
+                response_data = json_stream.httpx.load(api_response)
+            else:
+                response_data = json_stream.requests.load(api_response)
+            for item in response_data[items_key]:
+                yield json_stream.to_standard_types(item)
+        finally:
+            api_response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # release the own pool of clients that were never closed; shared pools
+        # are only released by close_shared_pool()
+        if getattr(self, "_own_session", None) is not None:
+            self.close()
 
     def close(self) -> None:
         """
         Close the underlying HTTP session and free pooled connections.
         Call this when you're done with the client (e.g., at application shutdown).
+
+        Does nothing for clients created with `share_session=True`, whose pool is
+        shared with other clients; use `close_shared_pool()` instead.
         """
+        if self._share_session:
+            return
         try:
             self._session.close()
         except Exception:
             # Silently ignore close errors; session close is best-effort.
             pass
+
+    @classmethod
+    def close_shared_pool(cls) -> None:
+        """
+        Close the sessions shared by clients created with `share_session=True`.
+        Call this at application shutdown. Existing clients stay usable: their next
+        request opens a new shared pool, as do clients created afterwards.
+        """
+        with _shared_sessions_lock:
+            sessions = list(_SHARED_SESSIONS.values())
+            _SHARED_SESSIONS.clear()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                # Silently ignore close errors; session close is best-effort.
+                pass
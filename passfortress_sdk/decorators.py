@@ -4,12 +4,37 @@ from functools import wraps
 def refresh_token_on_expiry(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
+        # refresh ahead of time so the request is not wasted on an expired token,
+        # and authenticate lazily, or anew when that refresh failed
+        if self.access_token is not None and self._token_expires_soon():
+            self._refresh_access_token(self.access_token)
+        if self.access_token is None:
+            self._ensure_access_token()
+        stale_access_token = self.access_token
         response = func(self, *args, **kwargs)
-        if response.status_code == 452:
-            self._auth_refresh_token()
-            response = func(
-                self, *args, **kwargs
-            )
-        return response
+        if response.status_code != 452:
+            return response
+        # retrying is only worth a round-trip if a new token was obtained
+        if self._refresh_access_token(stale_access_token) is None:
+            return response
+        return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def async_refresh_token_on_expiry(func):
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        if self.access_token is not None and self._token_expires_soon():
+            await self._refresh_access_token(self.access_token)
+        if self.access_token is None:
+            await self._ensure_access_token()
+        stale_access_token = self.access_token
+        response = await func(self, *args, **kwargs)
+        if response.status_code != 452:
+            return response
+        if await self._refresh_access_token(stale_access_token) is None:
+            return response
+        return await func(self, *args, **kwargs)
 
     return wrapper
@@ -0,0 +1,62 @@
+import random
+
+from urllib3.util.retry import Retry
+
+JITTER_NONE = "none"
+JITTER_EQUAL = "equal"
+JITTER_FULL = "full"
+JITTER_MODES = (JITTER_NONE, JITTER_EQUAL, JITTER_FULL)
+
+DEFAULT_BACKOFF_MAX = 120  # seconds, as in urllib3
+
+
+def apply_jitter(backoff_time, jitter):
+    """
+    Randomizes an exponential backoff delay so that clients retrying at the same
+    time do not hit the server again at the same instants.
+
+    Args:
+        backoff_time (float): The deterministic delay, in seconds.
+        jitter (str): One of ["none", "equal", "full"]. "full" picks a delay in
+        `[0, backoff_time]`, "equal" in `[backoff_time / 2, backoff_time]`.
+
+    Returns:
+        float: The delay to sleep, in seconds.
+    """
+    if jitter == JITTER_FULL:
+        return random.uniform(0, backoff_time)
+    if jitter == JITTER_EQUAL:
+        return backoff_time / 2 + random.uniform(0, backoff_time / 2)
+    return backoff_time
+
+
+def backoff_time(backoff_factor, retry_number, jitter, backoff_max=DEFAULT_BACKOFF_MAX):
+    """
+    Computes the delay before a retry on the same schedule as urllib3's `Retry`:
+    no delay before the first retry, then `backoff_factor * 2 ** (retry_number - 1)`
+    capped at `backoff_max`, randomized with `apply_jitter`.
+    """
+    if retry_number <= 1:
+        return 0
+    return apply_jitter(min(backoff_max, backoff_factor * (2 ** (retry_number - 1))), jitter)
+
+
+class JitteredRetry(Retry):
+    """
+    urllib3 `Retry` whose exponential backoff is randomized with `apply_jitter`.
+    """
+
+    def __init__(self, *args, jitter=JITTER_FULL, **kwargs):
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"jitter must be one of {JITTER_MODES}, got {jitter!r}")
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+
+    def new(self, **kwargs):
+        # urllib3 builds a new Retry after every attempt; keep the jitter mode
+        kwargs.setdefault("jitter", self.jitter)
+        return super().new(**kwargs)
+
+    def get_backoff_time(self):
+        # the parent delay is already clamped to the backoff maximum
+        return apply_jitter(super().get_backoff_time(), self.jitter)
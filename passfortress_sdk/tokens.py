@@ -0,0 +1,64 @@
+import base64
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+def token_expiry(access_token) -> Optional[float]:
+    """
+    Reads the expiry time of a JWT access token.
+
+    The signature is not verified: the value is only used to refresh the token
+    shortly before the server would reject it.
+
+    Args:
+        access_token (str): The JWT returned by the token endpoints.
+
+    Returns:
+        float: The `exp` claim as a UNIX timestamp, or None if the token does not carry one.
+    """
+    try:
+        payload = access_token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """
+    Thread-safe in-memory cache of access tokens, bounded to the `maxsize`
+    most recently used entries.
+
+    Passing the same instance to several clients lets them reuse a still-valid
+    token instead of requesting a new one on construction. Any mutable mapping
+    (a plain dict, `cachetools.TTLCache`, ...) can be used in its place.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def __setitem__(self, key, access_token):
+        with self._lock:
+            self._entries[key] = access_token
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def __len__(self):
+        return len(self._entries)
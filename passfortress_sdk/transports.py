@@ -0,0 +1,132 @@
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.timeout import Timeout
+
+from .retry import JITTER_MODES, backoff_time
+
+try:
+    import httpx
+except ImportError:  # optional dependency, see the "http2" extra
+    httpx = None
+
+
+class _BoundedWaitMixin:
+    # requests never passes `pool_timeout`, so with `block=True` a full pool
+    # would be waited on forever; wait at most the connect timeout instead
+    def urlopen(self, *args, **kwargs):
+        timeout = kwargs.get("timeout")
+        if kwargs.get("pool_timeout") is None and isinstance(timeout, Timeout):
+            connect_timeout = timeout.connect_timeout
+            if isinstance(connect_timeout, (int, float)):
+                kwargs["pool_timeout"] = connect_timeout
+        return super().urlopen(*args, **kwargs)
+
+
+class _BoundedWaitHTTPConnectionPool(_BoundedWaitMixin, HTTPConnectionPool):
+    pass
+
+
+class _BoundedWaitHTTPSConnectionPool(_BoundedWaitMixin, HTTPSConnectionPool):
+    pass
+
+
+class BoundedWaitHTTPAdapter(HTTPAdapter):
+    """
+    `HTTPAdapter` whose requests wait at most their connect timeout for a
+    connection from a full, blocking pool (`pool_block=True`).
+
+    A request that gets no connection in time raises `requests.ConnectTimeout`,
+    as the httpx transport does with its own pool timeout.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _BoundedWaitHTTPConnectionPool,
+            "https": _BoundedWaitHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        try:
+            return super().send(request, *args, **kwargs)
+        except EmptyPoolError as error:
+            raise requests.ConnectTimeout(error, request=request) from error
+
+
+class HttpxSession:
+    """
+    Stand-in for `requests.Session` backed by an HTTP/2 `httpx.Client`.
+
+    Concurrent requests to the API are multiplexed as streams over a single TLS
+    connection instead of one connection each. Only the parts of the Session API
+    used by `PassfortressClient` are provided, and request errors are re-raised
+    as their `requests` equivalents so both transports are handled alike.
+
+    Connection errors, timeouts and `status_forcelist` responses are retried with
+    the same backoff schedule as the urllib3 `Retry` of the requests transport.
+    """
+
+    def __init__(self, retries_total, backoff_factor, jitter, status_forcelist, pool_maxsize):
+        if httpx is None:
+            raise ImportError("the httpx transport requires httpx: pip install passfortress-sdk[http2]")
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"jitter must be one of {JITTER_MODES}, got {jitter!r}")
+        self._client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+            ),
+        )
+        self._retries_total = retries_total
+        self._backoff_factor = backoff_factor
+        self._jitter = jitter
+        self._status_forcelist = status_forcelist
+
+    @property
+    def headers(self):
+        return self._client.headers
+
+    @property
+    def cookies(self):
+        return self._client.cookies.jar
+
+    def post(self, url, data=None, headers=None, timeout=None, stream=False):
+        connect_timeout, read_timeout = timeout
+        request = self._client.build_request(
+            "POST",
+            url,
+            content=data,
+            headers=headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+
+        for retry_number in range(self._retries_total + 1):
+            if retry_number:
+                time.sleep(backoff_time(self._backoff_factor, retry_number, self._jitter))
+            is_last_attempt = retry_number == self._retries_total
+
+            try:
+                response = self._client.send(request, stream=stream)
+            except httpx.TimeoutException as error:
+                if not is_last_attempt:
+                    continue
+                raise requests.Timeout(str(error)) from error
+            except httpx.TransportError as error:
+                if not is_last_attempt:
+                    continue
+                raise requests.ConnectionError(str(error)) from error
+            except httpx.RequestError as error:
+                # e.g. an undecodable body or too many redirects, not worth retrying
+                raise requests.RequestException(str(error)) from error
+
+            if response.status_code in self._status_forcelist and not is_last_attempt:
+                response.close()
+                continue
+            return response
+
+    def close(self) -> None:
+        self._client.close()
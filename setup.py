@@ -7,5 +7,11 @@ setup(
     install_requires=[
         'requests==2.32.3'
     ],
+    extras_require={
+        'async': ['aiohttp>=3.8'],
+        'orjson': ['orjson>=3.6'],
+        'stream': ['json-stream>=2.3'],
+        'http2': ['httpx[http2]>=0.23'],
+    },
     python_requires='>=3.8',
 )
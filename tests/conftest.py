@@ -0,0 +1,126 @@
+import base64
+import gzip
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from passfortress_sdk.client import PassfortressClient
+
+
+def make_access_token(number, expires_in=3600):
+    """
+    Builds an unsigned JWT whose `exp` claim is `expires_in` seconds from now.
+    `number` makes every issued token distinct.
+    """
+    def encode(claims):
+        return base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+
+    return f"{encode({'alg': 'none'})}.{encode({'exp': time.time() + expires_in})}.sig{number}"
+
+
+class RecordedRequest:
+
+    def __init__(self, path, headers, body):
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        raw_body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw_body = gzip.decompress(raw_body)
+        request = RecordedRequest(self.path, dict(self.headers), json.loads(raw_body or b"{}"))
+        self.server.api.record(request)
+
+        status_code, headers, body = self.server.api.respond(request)
+        self.send_response(status_code)
+        headers = {"Content-Type": "application/json", **headers}
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeApi:
+    """
+    Local stand-in for the Passfortress API.
+
+    Token endpoints issue a new access token per call and every other endpoint
+    answers with a successful response, unless `handler` is set: it receives the
+    RecordedRequest and returns `(status_code, headers, body)` to send instead,
+    or None to fall back to the default response.
+    """
+
+    def __init__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.api = self
+        self._lock = threading.Lock()
+        self._token_numbers = itertools.count(1)
+        self.host = f"127.0.0.1:{self._server.server_address[1]}"
+        self.requests = []
+        self.handler = None
+        self.token_delay = 0
+        self.token_expires_in = 3600
+
+    def record(self, request):
+        with self._lock:
+            self.requests.append(request)
+
+    def paths(self):
+        return [request.path for request in self.requests]
+
+    def respond(self, request):
+        if self.handler is not None:
+            response = self.handler(request)
+            if response is not None:
+                status_code, headers, body = response
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                return status_code, headers, body
+        if request.path.startswith("/api/auth/"):
+            time.sleep(self.token_delay)
+            body = {"access_token": make_access_token(next(self._token_numbers), self.token_expires_in)}
+        else:
+            body = {"success": True, "message": "ok", "echo": request.body}
+        return 200, {}, json.dumps(body).encode()
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def api():
+    fake_api = FakeApi()
+    fake_api.start()
+    yield fake_api
+    fake_api.stop()
+
+
+@pytest.fixture(params=[PassfortressClient.TRANSPORT_REQUESTS, PassfortressClient.TRANSPORT_HTTPX])
+def transport(request):
+    if request.param == PassfortressClient.TRANSPORT_HTTPX:
+        pytest.importorskip("httpx")
+    return request.param
+
+
+@pytest.fixture(autouse=True)
+def _close_shared_pool():
+    yield
+    PassfortressClient.close_shared_pool()
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from passfortress_sdk.async_client import AsyncPassfortressClient  # noqa: E402
+from passfortress_sdk.client import PassfortressClient  # noqa: E402
+
+
+def test_endpoint_methods_send_the_same_payload_as_the_sync_client(api):
+    async def share_secret():
+        async with AsyncPassfortressClient("ak", "sk", "mk", host=api.host) as client:
+            return await client.share_secret("uuid", ["a@example.com"])
+
+    response = asyncio.run(share_secret())
+
+    assert response.success is True
+    assert api.requests[-1].path == "/api/share-secret/"
+    assert api.requests[-1].body == {
+        "api_key": "ak",
+        "master_key": "mk",
+        "secret": {"uuid": "uuid"},
+        "emails": ["a@example.com"],
+    }
+
+
+def test_pool_defaults_match_the_sync_client():
+    assert AsyncPassfortressClient.DEFAULT_POOL_MAXSIZE == PassfortressClient.DEFAULT_POOL_MAXSIZE
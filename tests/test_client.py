@@ -0,0 +1,69 @@
+import pytest
+import requests
+
+from passfortress_sdk.client import PassfortressClient, _base_url_for
+
+
+def test_eager_auth_requests_the_token_on_construction(api):
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, eager_auth=True)
+
+    assert client.access_token is not None
+    assert api.paths() == ["/api/auth/request-token/"]
+
+
+def test_eager_auth_fails_when_no_token_is_obtained(api):
+    api.handler = lambda request: (401, {}, {"detail": "invalid credentials"})
+
+    with pytest.raises(requests.RequestException):
+        PassfortressClient("ak", "sk", "mk", host=api.host, eager_auth=True)
+
+
+def test_lazy_auth_defers_the_token_request(api):
+    client = PassfortressClient("ak", "sk", "mk", host=api.host)
+    assert api.requests == []
+
+    client.hello()
+
+    assert api.paths() == ["/api/auth/request-token/", "/api/hello/"]
+
+
+def test_payload_is_spliced_after_the_credentials():
+    client = PassfortressClient("ak", "sk", "mk", host="localhost")
+
+    assert client._encode_payload({}) == b'{"api_key":"ak","master_key":"mk"}'
+    assert client._encode_payload({"secret": {"uuid": "a"}, "emails": ["b"]}) == (
+        b'{"api_key":"ak","master_key":"mk","secret":{"uuid":"a"},"emails":["b"]}'
+    )
+
+
+def test_payload_is_re_encoded_after_the_credentials_change():
+    client = PassfortressClient("ak", "sk", "mk", host="localhost")
+    client._encode_payload({})
+
+    client.api_key = "ak2"
+    client.master_key = "mk2"
+
+    assert client._encode_payload({"secret": {"uuid": "a"}}) == (
+        b'{"api_key":"ak2","master_key":"mk2","secret":{"uuid":"a"}}'
+    )
+
+
+def test_endpoint_payload_with_non_string_keys_is_sent(api):
+    client = PassfortressClient("ak", "sk", "mk", host=api.host)
+
+    response = client.add_secret({1: "a"})
+
+    assert response.status_code == 200
+    assert api.requests[-1].body == {"api_key": "ak", "master_key": "mk", "secret": {"1": "a"}}
+
+
+@pytest.mark.parametrize("host, base_url", [
+    ("passfortress.com", "https://passfortress.com"),
+    ("app.passfortress.com", "https://app.passfortress.com"),
+    ("eu.app.passfortress.com", "https://eu.app.passfortress.com"),
+    ("evilpassfortress.com", "http://evilpassfortress.com"),
+    ("passfortress.com.evil.com", "http://passfortress.com.evil.com"),
+    ("localhost:8000", "http://localhost:8000"),
+])
+def test_base_url_uses_https_only_for_passfortress_hosts(host, base_url):
+    assert _base_url_for(host) == base_url
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from passfortress_sdk.client import PassfortressClient
+
+
+def secret_of_payload_size(client, size):
+    # the payload grows by one byte per character of the secret's value
+    base_size = len(client._encode_payload({"secret": {"value": ""}}))
+    secret = {"value": "x" * (size - base_size)}
+    assert len(client._encode_payload({"secret": secret})) == size
+    return secret
+
+
+def content_encodings(api):
+    return [request.headers.get("Content-Encoding") for request in api.requests if request.path == "/api/add-secret/"]
+
+
+def test_bodies_from_the_minimum_size_are_gzipped(api, transport):
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport, compress_requests=True)
+    large_secret = secret_of_payload_size(client, client.COMPRESSION_MIN_SIZE)
+    small_secret = secret_of_payload_size(client, client.COMPRESSION_MIN_SIZE - 1)
+
+    client.add_secret(large_secret)
+    client.add_secret(small_secret)
+
+    assert content_encodings(api) == ["gzip", None]
+    assert api.requests[-2].body["secret"] == large_secret
+
+
+def test_bodies_are_not_gzipped_by_default(api):
+    client = PassfortressClient("ak", "sk", "mk", host=api.host)
+
+    client.add_secret(secret_of_payload_size(client, 4 * client.COMPRESSION_MIN_SIZE))
+
+    assert content_encodings(api) == [None]
+
+
+def test_async_bodies_from_the_minimum_size_are_gzipped(api):
+    pytest.importorskip("aiohttp")
+    from passfortress_sdk.async_client import AsyncPassfortressClient
+
+    async def add_secrets():
+        async with AsyncPassfortressClient("ak", "sk", "mk", host=api.host, compress_requests=True) as client:
+            large_secret = secret_of_payload_size(client, client.COMPRESSION_MIN_SIZE)
+            await client.add_secret(large_secret)
+            await client.add_secret(secret_of_payload_size(client, client.COMPRESSION_MIN_SIZE - 1))
+            return large_secret
+
+    large_secret = asyncio.run(add_secrets())
+
+    assert content_encodings(api) == ["gzip", None]
+    assert api.requests[-2].body["secret"] == large_secret
@@ -0,0 +1,28 @@
+import pytest
+
+from passfortress_sdk import _json
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_json, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize("obj, expected", [
+    ({"secret": {"uuid": "a", "value": "é"}}, '{"secret":{"uuid":"a","value":"é"}}'.encode("utf-8")),
+    ({"secret": {1: "a"}}, b'{"secret":{"1":"a"}}'),
+    ({"values": [float("nan"), float("inf"), 1.5]}, b'{"values":[null,null,1.5]}'),
+    ({"tags": ("a", "b")}, b'{"tags":["a","b"]}'),
+])
+def test_dumps_gives_the_same_bytes_with_either_backend(backend, obj, expected):
+    assert _json.dumps(obj) == expected
+
+
+def test_loads_raises_value_error_with_either_backend(backend):
+    assert _json.loads(b'{"a":[1]}') == {"a": [1]}
+    with pytest.raises(ValueError):
+        _json.loads(b"{not json")
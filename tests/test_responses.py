@@ -0,0 +1,61 @@
+import pytest
+
+from passfortress_sdk.client import ClientResponse, PassfortressClient
+
+
+def test_client_response_defaults():
+    response = ClientResponse(status_code=200)
+
+    assert (response.success, response.message, response.data) == (False, "", {})
+    assert response.data is not ClientResponse(status_code=200).data
+    with pytest.raises(AttributeError):
+        response.extra = "not a slot"
+
+
+def build(status_code, content_type, content):
+    return PassfortressClient._build_client_response(status_code, content_type, content)
+
+
+def test_json_body_is_split_into_success_message_and_data():
+    response = build(200, "application/json; charset=utf-8", b'{"success":true,"message":"ok","secret":{"uuid":"a"}}')
+
+    assert (response.status_code, response.success, response.message) == (200, True, "ok")
+    assert response.data == {"secret": {"uuid": "a"}}
+
+
+def test_non_json_body_is_returned_unparsed():
+    response = build(502, "text/html", b"<html><body>502 Bad Gateway</body></html>")
+
+    assert (response.status_code, response.success) == (502, False)
+    assert response.message == "<html><body>502 Bad Gateway</body></html>"
+    assert response.data == {}
+
+
+def test_non_json_message_is_truncated():
+    response = build(502, "text/html", b"x" * 1000 + b"\xff")
+
+    assert response.message == "x" * 256
+    assert build(502, "", b"\xffabc").message == "\ufffdabc"
+
+
+def test_malformed_json_body_keeps_the_decode_error():
+    response = build(200, "application/json", b'{"success": tr')
+
+    assert (response.status_code, response.success, response.data) == (200, False, {})
+    assert isinstance(response.message, ValueError)
+
+
+def test_html_error_page_reaches_the_caller(api, transport):
+    def bad_gateway(request):
+        if request.path.startswith("/api/auth/"):
+            return None
+        return 502, {"Content-Type": "text/html"}, b"<html>502 Bad Gateway</html>"
+
+    api.handler = bad_gateway
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport, retries_total=0)
+
+    response = client.get_secret("uuid")
+
+    assert (response.status_code, response.success, response.message, response.data) == (
+        502, False, "<html>502 Bad Gateway</html>", {},
+    )
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from passfortress_sdk.client import PassfortressClient
+from passfortress_sdk.retry import JITTER_EQUAL, JITTER_FULL, JITTER_NONE, JitteredRetry, apply_jitter, backoff_time
+
+
+def unavailable(request):
+    if request.path.startswith("/api/auth/"):
+        return None
+    return 503, {}, {"success": False, "message": "unavailable"}
+
+
+def test_jittered_retry_new_keeps_the_jitter_mode():
+    retry = JitteredRetry(total=3, backoff_factor=0.5, jitter=JITTER_EQUAL)
+
+    retry = retry.new(total=2).increment(method="POST", url="/")
+
+    assert retry.jitter == JITTER_EQUAL
+    assert retry.total == 1
+
+
+def test_jittered_retry_rejects_unknown_jitter():
+    with pytest.raises(ValueError):
+        JitteredRetry(total=3, jitter="random")
+
+
+def test_backoff_time_follows_the_urllib3_schedule():
+    delays = [backoff_time(0.5, retry_number, JITTER_NONE) for retry_number in range(1, 6)]
+
+    assert delays == [0, 1.0, 2.0, 4.0, 8.0]
+    assert backoff_time(0.5, 20, JITTER_NONE, backoff_max=10) == 10
+
+
+def test_apply_jitter_stays_within_its_range():
+    for _ in range(100):
+        assert 0 <= apply_jitter(4.0, JITTER_FULL) <= 4.0
+        assert 2.0 <= apply_jitter(4.0, JITTER_EQUAL) <= 4.0
+
+
+def test_forcelist_statuses_are_retried(api, transport):
+    api.handler = unavailable
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport,
+                                retries_total=2, backoff_factor=0)
+
+    response = client.get_secret("uuid")
+
+    assert response.status_code == 503
+    assert api.paths().count("/api/get-secret/") == 3
+
+
+def test_async_forcelist_statuses_are_retried(api):
+    pytest.importorskip("aiohttp")
+    from passfortress_sdk.async_client import AsyncPassfortressClient
+
+    async def get_secret():
+        async with AsyncPassfortressClient("ak", "sk", "mk", host=api.host, retries_total=2,
+                                           backoff_factor=0) as client:
+            return await client.get_secret("uuid")
+
+    api.handler = unavailable
+    response = asyncio.run(get_secret())
+
+    assert response.status_code == 503
+    assert api.paths().count("/api/get-secret/") == 3
+
+
+def test_unknown_jitter_is_rejected_on_every_transport(transport):
+    with pytest.raises(ValueError):
+        PassfortressClient("ak", "sk", "mk", host="localhost", transport=transport, jitter="ful")
+
+
+def test_async_client_rejects_unknown_jitter():
+    pytest.importorskip("aiohttp")
+    from passfortress_sdk.async_client import AsyncPassfortressClient
+
+    with pytest.raises(ValueError):
+        AsyncPassfortressClient("ak", "sk", "mk", host="localhost", jitter="ful")
@@ -0,0 +1,42 @@
+from passfortress_sdk.client import PassfortressClient
+
+
+def set_tenant_cookie(request):
+    if request.path.startswith("/api/auth/"):
+        return None
+    tenant = request.body["api_key"]
+    return 200, {"Set-Cookie": f"sessionid={tenant}; Path=/"}, {"success": True}
+
+
+def test_shared_session_does_not_replay_cookies_across_clients(api, transport):
+    api.handler = set_tenant_cookie
+    tenant_a = PassfortressClient("tenant-a", "sk", "mk", host=api.host, transport=transport)
+    tenant_b = PassfortressClient("tenant-b", "sk", "mk", host=api.host, transport=transport)
+    assert tenant_a._session is tenant_b._session
+
+    for client in (tenant_a, tenant_b, tenant_a, tenant_b):
+        assert client.get_secret("uuid").status_code == 200
+
+    assert [request.headers.get("Cookie") for request in api.requests] == [None] * len(api.requests)
+
+
+def test_own_session_keeps_cookies(api, transport):
+    api.handler = set_tenant_cookie
+    with PassfortressClient("tenant-a", "sk", "mk", host=api.host, transport=transport,
+                            share_session=False) as client:
+        client.get_secret("uuid")
+        client.get_secret("uuid")
+
+    assert api.requests[-1].headers.get("Cookie") == "sessionid=tenant-a"
+
+
+def test_clients_survive_close_shared_pool(api, transport):
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport)
+    assert client.get_secret("uuid").status_code == 200
+    closed_session = client._session
+
+    PassfortressClient.close_shared_pool()
+
+    assert client.get_secret("uuid").status_code == 200
+    new_client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport)
+    assert client._session is new_client._session is not closed_session
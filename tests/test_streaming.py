@@ -0,0 +1,59 @@
+import pytest
+import requests
+
+from passfortress_sdk import client as client_module
+from passfortress_sdk.client import PassfortressClient
+
+pytest.importorskip("json_stream")
+
+
+def secrets_list(request):
+    if request.path != "/api/get-secrets/":
+        return None
+    return 200, {}, {"success": True, "results": [{"uuid": "a", "tags": ["x"]}, {"uuid": "b", "tags": []}]}
+
+
+def test_get_secrets_iter_yields_each_secret(api, transport):
+    api.handler = secrets_list
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport)
+
+    secrets = list(client.get_secrets_iter({"secret_type": "password"}))
+
+    assert secrets == [{"uuid": "a", "tags": ["x"]}, {"uuid": "b", "tags": []}]
+    assert api.requests[-1].body["secret"] == {"secret_type": "password"}
+
+
+def test_get_secrets_iter_retries_a_452_with_a_refreshed_token(api, transport):
+    def reject_first_call(request):
+        if request.path == "/api/get-secrets/" and api.paths().count(request.path) == 1:
+            return 452, {}, {"success": False, "message": "token expired"}
+        return secrets_list(request)
+
+    api.handler = reject_first_call
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport)
+
+    secrets = list(client.get_secrets_iter({"secret_type": "password"}))
+
+    assert [secret["uuid"] for secret in secrets] == ["a", "b"]
+    assert api.paths() == [
+        "/api/auth/request-token/",
+        "/api/get-secrets/",
+        "/api/auth/refresh-token/",
+        "/api/get-secrets/",
+    ]
+
+
+def test_get_secrets_iter_raises_on_error_status(api, transport):
+    api.handler = lambda request: None if request.path.startswith("/api/auth/") else (400, {}, {"success": False})
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport)
+
+    with pytest.raises(requests.HTTPError):
+        list(client.get_secrets_iter({"secret_type": "password"}))
+
+
+def test_get_secrets_iter_requires_json_stream_when_called(monkeypatch):
+    monkeypatch.setattr(client_module, "json_stream", None)
+    client = PassfortressClient("ak", "sk", "mk", host="localhost")
+
+    with pytest.raises(ImportError):
+        client.get_secrets_iter({"secret_type": "password"})
@@ -0,0 +1,187 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from passfortress_sdk.client import PassfortressClient
+from passfortress_sdk.tokens import TokenCache
+
+
+def reject_with_452(request):
+    if request.path.startswith("/api/auth/"):
+        return None
+    return 452, {}, {"success": False, "message": "token expired"}
+
+
+def reject_first_call_with_452(api):
+    def handler(request):
+        if request.path.startswith("/api/auth/") or api.paths().count(request.path) > 1:
+            return None
+        return reject_with_452(request)
+
+    return handler
+
+
+def fail_refresh(request):
+    if request.path == "/api/auth/refresh-token/":
+        return 401, {}, {"detail": "revoked"}
+    return reject_with_452(request)
+
+
+def test_concurrent_first_calls_request_one_token(api):
+    api.token_delay = 0.2
+    client = PassfortressClient("ak", "sk", "mk", host=api.host)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(client.get_secret, range(8)))
+
+    assert [response.status_code for response in responses] == [200] * 8
+    assert api.paths().count("/api/auth/request-token/") == 1
+
+
+def test_452_is_retried_once_with_a_refreshed_token(api):
+    api.handler = reject_first_call_with_452(api)
+    client = PassfortressClient("ak", "sk", "mk", host=api.host)
+
+    response = client.get_secret("uuid")
+
+    assert response.status_code == 200
+    assert api.paths() == [
+        "/api/auth/request-token/",
+        "/api/get-secret/",
+        "/api/auth/refresh-token/",
+        "/api/get-secret/",
+    ]
+    assert api.requests[1].headers["Authorization"] != api.requests[3].headers["Authorization"]
+
+
+def test_failed_refresh_after_452_does_not_resend_the_request(api):
+    api.handler = fail_refresh
+    client = PassfortressClient("ak", "sk", "mk", host=api.host)
+
+    response = client.get_secret("uuid")
+
+    assert response.status_code == 452
+    assert api.paths() == ["/api/auth/request-token/", "/api/get-secret/", "/api/auth/refresh-token/"]
+
+
+def test_async_concurrent_first_calls_request_one_token(api):
+    pytest.importorskip("aiohttp")
+    from passfortress_sdk.async_client import AsyncPassfortressClient
+
+    async def get_secrets():
+        async with AsyncPassfortressClient("ak", "sk", "mk", host=api.host) as client:
+            return await client.get_secrets_bulk(range(8))
+
+    api.token_delay = 0.2
+    responses = asyncio.run(get_secrets())
+
+    assert [response.status_code for response in responses] == [200] * 8
+    assert api.paths().count("/api/auth/request-token/") == 1
+
+
+def test_async_failed_refresh_after_452_does_not_resend_the_request(api):
+    pytest.importorskip("aiohttp")
+    from passfortress_sdk.async_client import AsyncPassfortressClient
+
+    async def get_secret():
+        async with AsyncPassfortressClient("ak", "sk", "mk", host=api.host) as client:
+            return await client.get_secret("uuid")
+
+    api.handler = fail_refresh
+    response = asyncio.run(get_secret())
+
+    assert response.status_code == 452
+    assert api.paths() == ["/api/auth/request-token/", "/api/get-secret/", "/api/auth/refresh-token/"]
+
+
+def fail_refresh_only(request):
+    if request.path == "/api/auth/refresh-token/":
+        return 401, {}, {"detail": "revoked"}
+    return None
+
+
+def test_expiring_token_is_refreshed_before_the_request(api):
+    api.token_expires_in = 10
+    client = PassfortressClient("ak", "sk", "mk", host=api.host)
+
+    client.hello()
+    client.hello()
+
+    assert api.paths() == [
+        "/api/auth/request-token/",
+        "/api/hello/",
+        "/api/auth/refresh-token/",
+        "/api/hello/",
+    ]
+
+
+def test_failed_proactive_refresh_requests_a_new_token(api):
+    api.handler = fail_refresh_only
+    api.token_expires_in = 10
+    cache = TokenCache()
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, token_cache=cache)
+    client.hello()
+    api.token_expires_in = 3600
+
+    client.hello()
+    client.hello()
+
+    assert api.paths() == [
+        "/api/auth/request-token/",
+        "/api/hello/",
+        "/api/auth/refresh-token/",
+        "/api/auth/request-token/",
+        "/api/hello/",
+        "/api/hello/",
+    ]
+    assert cache.get(client._token_cache_key()) == client.access_token
+
+
+def test_failed_refresh_after_452_requests_a_new_token_on_the_next_call(api):
+    def reject_first_token(request):
+        if request.path == "/api/auth/refresh-token/":
+            return 401, {}, {"detail": "revoked"}
+        if request.headers.get("Authorization", "").endswith("sig1"):
+            return reject_with_452(request)
+        return None
+
+    api.handler = reject_first_token
+    cache = TokenCache()
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, token_cache=cache)
+
+    assert client.get_secret("uuid").status_code == 452
+    assert len(cache) == 0
+    assert client.get_secret("uuid").status_code == 200
+    assert api.paths() == [
+        "/api/auth/request-token/",
+        "/api/get-secret/",
+        "/api/auth/refresh-token/",
+        "/api/auth/request-token/",
+        "/api/get-secret/",
+    ]
+
+
+def test_async_failed_proactive_refresh_requests_a_new_token(api):
+    pytest.importorskip("aiohttp")
+    from passfortress_sdk.async_client import AsyncPassfortressClient
+
+    async def say_hello_three_times():
+        async with AsyncPassfortressClient("ak", "sk", "mk", host=api.host) as client:
+            await client.hello()
+            api.token_expires_in = 3600
+            await client.hello()
+            await client.hello()
+
+    api.handler = fail_refresh_only
+    api.token_expires_in = 10
+    asyncio.run(say_hello_three_times())
+
+    assert api.paths() == [
+        "/api/auth/request-token/",
+        "/api/hello/",
+        "/api/auth/refresh-token/",
+        "/api/auth/request-token/",
+        "/api/hello/",
+        "/api/hello/",
+    ]
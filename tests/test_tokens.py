@@ -0,0 +1,55 @@
+import time
+
+from conftest import make_access_token
+from passfortress_sdk.client import PassfortressClient
+from passfortress_sdk.tokens import TokenCache, token_expiry
+
+
+def test_token_expiry_reads_the_exp_claim():
+    before = time.time()
+    expiry = token_expiry(make_access_token(1, expires_in=60))
+
+    assert before + 60 <= expiry <= time.time() + 60
+    assert token_expiry("not-a-jwt") is None
+    assert token_expiry(None) is None
+
+
+def test_token_cache_evicts_the_least_recently_used_entry():
+    cache = TokenCache(maxsize=2)
+    cache["a"] = "token-a"
+    cache["b"] = "token-b"
+    cache.get("a")
+    cache["c"] = "token-c"
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "token-a"
+
+
+def test_clients_with_the_same_credentials_share_a_cached_token(api):
+    cache = TokenCache()
+    PassfortressClient("ak", "sk", "mk", host=api.host, token_cache=cache).hello()
+    PassfortressClient("ak", "sk", "mk", host=api.host, token_cache=cache).hello()
+
+    assert api.paths().count("/api/auth/request-token/") == 1
+    assert api.requests[1].headers["Authorization"] == api.requests[2].headers["Authorization"]
+
+
+def test_a_different_secret_key_misses_the_cache(api):
+    cache = TokenCache()
+    PassfortressClient("ak", "sk", "mk", host=api.host, token_cache=cache).hello()
+    PassfortressClient("ak", "WRONG", "mk", host=api.host, token_cache=cache).hello()
+
+    assert api.paths().count("/api/auth/request-token/") == 2
+    assert api.requests[2].body["secret_key"] == "WRONG"
+    assert all("sk" not in key for key in cache._entries)
+
+
+def test_expiring_cached_tokens_are_not_reused(api):
+    cache = TokenCache()
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, token_cache=cache)
+    cache[client._token_cache_key()] = make_access_token(0, expires_in=10)
+
+    client.hello()
+
+    assert api.paths() == ["/api/auth/request-token/", "/api/hello/"]
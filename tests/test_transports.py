@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from passfortress_sdk.client import PassfortressClient
+
+
+def send_undecodable_body(request):
+    if request.path.startswith("/api/auth/"):
+        return None
+    return 200, {"Content-Encoding": "gzip"}, b"not gzip data"
+
+
+def test_request_errors_become_network_error_responses(api, transport):
+    api.handler = send_undecodable_body
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport)
+
+    response = client.get_secret("uuid")
+
+    assert response.status_code == 0
+    assert response.success is False
+    assert response.data == {}
+
+
+def many_secrets(request):
+    if request.path != "/api/get-secrets/":
+        return None
+    return 200, {}, {"success": True, "results": [{"uuid": str(number)} for number in range(50000)]}
+
+
+def test_full_pool_waits_at_most_the_connect_timeout(api, transport):
+    pytest.importorskip("json_stream")
+    api.handler = many_secrets
+    client = PassfortressClient("ak", "sk", "mk", host=api.host, transport=transport, timeout=(0.3, 2.0),
+                                retries_total=0, pool_connections=1, pool_maxsize=1, share_session=False)
+    responses = []
+
+    def get_secret_while_streaming():
+        for _ in client.get_secrets_iter({"secret_type": "password"}):
+            responses.append(client.get_secret("uuid"))
+            break
+
+    worker = threading.Thread(target=get_secret_while_streaming, daemon=True)
+    worker.start()
+    worker.join(timeout=10)
+
+    assert not worker.is_alive()
+    assert [response.status_code for response in responses] == [0]